@@ -1,15 +1,21 @@
 from pydantic import BaseModel
 import fastapi
 from fastapi import HTTPException
-from typing import Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+from typing import List, Optional
+import asyncio
+import hashlib
 import json
 import os
+import threading
 from dotenv import load_dotenv
 import uvicorn
-from CRM import extract_crm_data, format_crm_output
-from task import get_all_meetings_context, extract_task_priorities, format_task_output
+from cachetools import TTLCache
+from CRM import extract_crm_data, extract_crm_data_stream, format_crm_output
+from task import get_all_meetings_context, extract_task_priorities, extract_task_priorities_stream, format_task_output
 from vdb import index
-from question import answer_question, format_qa_output
+from question import answer_question, answer_question_stream, format_qa_output
 
 load_dotenv()
 
@@ -18,16 +24,63 @@ class MeetingInput(BaseModel):
 
 class VectorIdInput(BaseModel):
     vector_id: str
+class BatchVectorIdInput(BaseModel):
+    vector_ids: List[str]
 class QuestionInput(BaseModel):
     question: str
+    # {"enabled": "on"/"off"} - lets callers (e.g. q_tester re-runs) opt in
+    # to the server-side answer cache or force a fresh answer
+    cache_options: Optional[dict] = None
 
 app = fastapi.FastAPI(
     title="Meeting Notes AI Agent",
-    description="Converts meeting notes into structured CRM data, tasks, and Q&A"
+    description="Converts meeting notes into structured CRM data, tasks, and Q&A",
+    default_response_class=ORJSONResponse  # orjson serializes responses 2-5x faster
 )
 
+# In-process cache for Pinecone fetches - meeting notes change rarely, so a
+# short TTL saves a network round-trip on every repeat lookup of the same ID.
+# TTLCache is not thread-safe and these caches are hit from worker threads
+# (sync endpoints run in FastAPI's threadpool, _fetch_vector runs via
+# asyncio.to_thread), so every access goes through the matching lock.
+_vector_cache = TTLCache(maxsize=1024, ttl=300)
+_vector_cache_lock = threading.Lock()
+
+# Cache for full QA responses - repeated questions (tester re-runs, demos)
+# skip the embedding + Pinecone + GPT round-trip entirely
+_qa_cache = TTLCache(maxsize=256, ttl=300)
+_qa_cache_lock = threading.Lock()
+
+
+def _qa_cache_key(question: str) -> str:
+    """Cache key for a question: sha256 of the normalized text."""
+    return hashlib.sha256(question.strip().lower().encode()).hexdigest()
+
+
+def _fetch_vector(vector_id: str):
+    """
+    Fetch a single vector by ID, consulting the TTL cache first.
+
+    Args:
+        vector_id: The Pinecone vector ID (e.g., "meeting-acme")
+
+    Returns:
+        The vector data object, or None if the ID doesn't exist
+    """
+    with _vector_cache_lock:
+        cached = _vector_cache.get(vector_id)
+    if cached is not None:
+        return cached
+
+    response = index.fetch(ids=[vector_id])
+    vector_data = response.vectors.get(vector_id)
+    if vector_data is not None:
+        with _vector_cache_lock:
+            _vector_cache[vector_id] = vector_data
+    return vector_data
+
 @app.post("/crm-data")
-def get_crm_data(input: VectorIdInput):
+async def get_crm_data(input: VectorIdInput):
     """
     Extract structured CRM data from a meeting stored in the database.
     
@@ -57,17 +110,17 @@ def get_crm_data(input: VectorIdInput):
         vector_id = input.vector_id
         
         # Step 1: Fetch meeting notes from database using vector_id
-        response = index.fetch(ids=[vector_id])
-        
+        # (TTL-cached; run in a thread so a cache miss doesn't stall the loop)
+        vector_data = await asyncio.to_thread(_fetch_vector, vector_id)
+
         # Fallback: Check if vector exists (invalid ID handling)
-        if vector_id not in response.vectors:
+        if vector_data is None:
             return {
                 "status": "error",
                 "message": f"Vector ID '{vector_id}' not found in database. Please use a valid ID like: meeting-acme, meeting-buildco, meeting-techstart, meeting-nextgen, or meeting-dataflow"
             }
-        
+
         # Step 2: Extract meeting notes text from metadata
-        vector_data = response.vectors[vector_id]
         metadata = vector_data.metadata or {}
         meeting_notes = metadata.get('text', '')
         
@@ -78,7 +131,7 @@ def get_crm_data(input: VectorIdInput):
             }
         
         # Step 3: Extract CRM data using RAG
-        crm_data = extract_crm_data(meeting_notes)
+        crm_data = await extract_crm_data(meeting_notes)
         
         return {
             "status": "success",
@@ -92,6 +145,144 @@ def get_crm_data(input: VectorIdInput):
             "message": str(e)
         }
 
+@app.post("/crm-data/stream")
+async def get_crm_data_stream(input: VectorIdInput):
+    """
+    Stream CRM extraction for a stored meeting as Server-Sent Events.
+
+    Emits `progress` events while GPT generates the JSON, then a final
+    `result` event with the same payload shape as POST /crm-data. Use this
+    when a UI should show activity immediately instead of waiting the full
+    generation time for the response body.
+
+    Args:
+        input: VectorIdInput model containing vector_id
+
+    Returns:
+        text/event-stream response with progress and result events
+
+    Example:
+        POST /crm-data/stream
+        Body: {"vector_id": "meeting-acme"}
+    """
+    if not input.vector_id:
+        return {
+            "status": "error",
+            "message": "vector_id is required"
+        }
+
+    vector_id = input.vector_id
+    vector_data = await asyncio.to_thread(_fetch_vector, vector_id)
+
+    if vector_data is None:
+        return {
+            "status": "error",
+            "message": f"Vector ID '{vector_id}' not found in database. Please use a valid ID like: meeting-acme, meeting-buildco, meeting-techstart, meeting-nextgen, or meeting-dataflow"
+        }
+
+    metadata = vector_data.metadata or {}
+    meeting_notes = metadata.get('text', '')
+
+    if not meeting_notes:
+        return {
+            "status": "error",
+            "message": f"No meeting notes found for vector ID '{vector_id}'"
+        }
+
+    async def event_stream():
+        async for event, payload in extract_crm_data_stream(meeting_notes):
+            if event == "progress":
+                yield f"event: progress\ndata: {payload}\n\n"
+            else:
+                body = orjson.dumps({
+                    "status": "success",
+                    "vector_id": vector_id,
+                    "data": payload,
+                    "formatted": format_crm_output(payload)
+                }).decode()
+                yield f"event: result\ndata: {body}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post("/crm-data/batch")
+async def get_crm_data_batch(input: BatchVectorIdInput):
+    """
+    Extract structured CRM data for several stored meetings in one request.
+
+    This endpoint:
+    1. Fetches all requested vector_ids from Pinecone in a single call
+    2. Runs the GPT extractions concurrently via asyncio.gather
+    3. Returns per-id results in the same order as the request
+
+    Total latency is roughly the slowest single extraction instead of the
+    sum of all of them.
+
+    Args:
+        input: BatchVectorIdInput model containing vector_ids
+
+    Returns:
+        JSON object with a list of per-id CRM results
+
+    Example:
+        POST /crm-data/batch
+        Body: {"vector_ids": ["meeting-acme", "meeting-techstart"]}
+    """
+    try:
+        if not input.vector_ids:
+            return {
+                "status": "error",
+                "message": "vector_ids is required"
+            }
+
+        # One Pinecone fetch covers every requested ID
+        response = await asyncio.to_thread(index.fetch, ids=input.vector_ids)
+
+        async def _extract_one(vector_id: str):
+            vector_data = response.vectors.get(vector_id)
+            metadata = (vector_data.metadata or {}) if vector_data else {}
+            meeting_notes = metadata.get('text', '')
+            if not meeting_notes:
+                return {
+                    "status": "error",
+                    "vector_id": vector_id,
+                    "message": f"Vector ID '{vector_id}' not found or has no meeting notes"
+                }
+            crm_data = await extract_crm_data(meeting_notes)
+            return {
+                "status": "success",
+                "vector_id": vector_id,
+                "data": crm_data,
+                "formatted": format_crm_output(crm_data)
+            }
+
+        results = await asyncio.gather(
+            *[_extract_one(vector_id) for vector_id in input.vector_ids],
+            return_exceptions=True
+        )
+
+        # Turn raised exceptions into per-id errors, preserving request order
+        output = []
+        for vector_id, result in zip(input.vector_ids, results):
+            if isinstance(result, Exception):
+                output.append({
+                    "status": "error",
+                    "vector_id": vector_id,
+                    "message": str(result)
+                })
+            else:
+                output.append(result)
+
+        return {
+            "status": "success",
+            "results": output
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": str(e)
+        }
+
 @app.post("/task-data")
 def get_task_data(request: MeetingInput):
     """
@@ -140,22 +331,85 @@ def get_question_answer_data(input: QuestionInput):
                 status_code=422, 
                 detail=err_str
             )
+        # Serve repeated questions from the answer cache when the caller
+        # opts in via cache_options
+        cache_enabled = (input.cache_options or {}).get("enabled") == "on"
+        cache_key = _qa_cache_key(input.question)
+        if cache_enabled:
+            with _qa_cache_lock:
+                cached = _qa_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         #answer questions
-        qa_data = answer_question(input.question)   
+        qa_data = answer_question(input.question)
         #we get this as a dictionary
-        # now we can exttract the necessary fields 
-        return {
+        # now we can exttract the necessary fields
+        result = {
             "status": qa_data["status"],
             "question": qa_data["question"],
             "answer": qa_data["answer"],
             "meetings_used": qa_data["meetings_used"],
             "formatted_output": format_qa_output(qa_data)
         }
+        if cache_enabled and qa_data["status"] == "success":
+            with _qa_cache_lock:
+                _qa_cache[cache_key] = result
+        return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
              
 
+@app.post("/task-data/stream")
+def get_task_data_stream(request: MeetingInput):
+    """
+    Stream the prioritized task list as Server-Sent Events.
+
+    Emits `data` events carrying text fragments while GPT generates the
+    task list, then a final `done` event. Use this instead of POST
+    /task-data when output should appear as it is generated.
+    """
+    def event_stream():
+        for token in extract_task_priorities_stream(request.meeting_notes):
+            yield f"data: {orjson.dumps({'token': token}).decode()}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post("/question-answer-data/stream")
+def get_question_answer_data_stream(input: QuestionInput):
+    """
+    Stream the answer to a question as Server-Sent Events.
+
+    Emits `data` events carrying text fragments while GPT generates the
+    answer, then a final `done` event. The non-streaming POST
+    /question-answer-data keeps returning the full JSON payload.
+    """
+    if not input.question or input.question.strip() == "":
+        raise HTTPException(status_code=422, detail="Question is invalid")
+
+    def event_stream():
+        for token in answer_question_stream(input.question):
+            yield f"data: {orjson.dumps({'token': token}).decode()}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@app.post("/admin/invalidate")
+def invalidate_vector_cache():
+    """Clear the in-process vector cache (use after re-populating the database)"""
+    with _vector_cache_lock:
+        invalidated = len(_vector_cache)
+        _vector_cache.clear()
+    return {
+        "status": "success",
+        "invalidated": invalidated
+    }
+
+
 @app.get("/")
 def root():
     """Health check endpoint"""
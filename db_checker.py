@@ -4,7 +4,9 @@ Checks the validity and integrity of data stored in Pinecone vector database.
 Validates that all source files match what's stored in the database.
 """
 
+import hashlib
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 import numpy as np
@@ -17,7 +19,6 @@ from vdb import (
     DATA_DIR,
     INDEX_NAME,
     DIMENSION,
-    get_openai_embedding,
     read_meeting_notes
 )
 
@@ -28,6 +29,92 @@ pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
 openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 index = pc.Index(INDEX_NAME)
 
+# Metadata fields every meeting vector must carry
+REQUIRED_METADATA_FIELDS = frozenset(['text', 'filename', 'source'])
+
+
+# Persistent embedding cache - meeting notes rarely change between
+# validation runs, so re-embedding byte-identical text is wasted API spend.
+# Embeddings are stored as .npy files keyed by sha256(model + "\0" + text),
+# with an in-memory dict in front for repeat lookups within one run.
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_CACHE_DIR = Path(__file__).parent / ".embedding_cache"
+_embedding_memory_cache: Dict[str, list] = {}
+
+
+def _embedding_cache_key(text: str) -> str:
+    """Cache key for a text: sha256 over the model name and the text."""
+    return hashlib.sha256(f"{EMBEDDING_MODEL}\0{text}".encode()).hexdigest()
+
+
+def _embedding_cache_get(text: str) -> Any:
+    """Return the cached embedding for text, or None on a miss."""
+    key = _embedding_cache_key(text)
+    if key in _embedding_memory_cache:
+        return _embedding_memory_cache[key]
+
+    cache_file = EMBEDDING_CACHE_DIR / f"{key}.npy"
+    if cache_file.exists():
+        try:
+            embedding = np.load(cache_file).tolist()
+            _embedding_memory_cache[key] = embedding
+            return embedding
+        except Exception:
+            # Corrupt cache file - treat as a miss and regenerate
+            pass
+    return None
+
+
+def _embedding_cache_put(text: str, embedding: list) -> None:
+    """Store an embedding in both the in-memory and on-disk caches."""
+    key = _embedding_cache_key(text)
+    _embedding_memory_cache[key] = embedding
+    try:
+        EMBEDDING_CACHE_DIR.mkdir(exist_ok=True)
+        np.save(EMBEDDING_CACHE_DIR / f"{key}.npy", np.array(embedding, dtype=np.float32))
+    except Exception as e:
+        # Cache is an optimization - never fail the validation over it
+        print(f"Warning: could not write embedding cache: {e}")
+
+
+def batch_openai_embeddings(texts: List[str], batch_size: int = 128) -> List[Any]:
+    """
+    Generate embeddings for many texts using chunked batch API calls.
+
+    One request per batch_size texts instead of one per text - embedding is
+    network-bound, so batching cuts wall time roughly N-fold for N texts.
+    Texts already in the persistent cache are served from it, so only
+    changed/new texts hit the API at all.
+
+    Args:
+        texts: Texts to embed
+        batch_size: Maximum texts per API call (default: 128)
+
+    Returns:
+        List of embeddings aligned with texts; entries are None for texts
+        whose batch failed, so callers can warn per-id without losing the run
+    """
+    embeddings: List[Any] = [_embedding_cache_get(text) for text in texts]
+
+    # Only cache misses go to the API
+    miss_indices = [i for i, embedding in enumerate(embeddings) if embedding is None]
+
+    for start in range(0, len(miss_indices), batch_size):
+        chunk_indices = miss_indices[start:start + batch_size]
+        chunk = [texts[i] for i in chunk_indices]
+        try:
+            response = openai_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=chunk
+            )
+            for i, item in zip(chunk_indices, response.data):
+                embeddings[i] = item.embedding
+                _embedding_cache_put(texts[i], item.embedding)
+        except Exception as e:
+            print(f"Error embedding batch starting at index {chunk_indices[0]}: {e}")
+
+    return embeddings
+
 
 class ValidationResult:
     """Container for validation results."""
@@ -131,19 +218,26 @@ def fetch_vectors_by_ids(vector_ids: List[str]) -> Dict[str, Any]:
     if not vector_ids:
         return vectors
     
-    try:
-        # Fetch vectors (Pinecone allows fetching up to 1000 at a time)
-        batch_size = 100
-        for i in range(0, len(vector_ids), batch_size):
-            batch_ids = vector_ids[i:i + batch_size]
-            response = index.fetch(ids=batch_ids)
-            
-            for vector_id, vector_data in response.vectors.items():
-                vectors[vector_id] = vector_data
-                
-    except Exception as e:
-        print(f"Error fetching vectors: {e}")
-    
+    # Fetch vectors (Pinecone allows fetching up to 1000 at a time).
+    # Batches are independent, so issue them concurrently - the total fetch
+    # takes roughly one round-trip instead of one per batch.
+    batch_size = 100
+    batches = [vector_ids[i:i + batch_size] for i in range(0, len(vector_ids), batch_size)]
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        futures = {
+            executor.submit(index.fetch, ids=batch_ids): batch_ids
+            for batch_ids in batches
+        }
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+                for vector_id, vector_data in response.vectors.items():
+                    vectors[vector_id] = vector_data
+            except Exception as e:
+                batch_ids = futures[future]
+                print(f"Error fetching vectors {batch_ids[0]}..{batch_ids[-1]}: {e}")
+
     return vectors
 
 
@@ -217,20 +311,26 @@ def validate_text_content(
     print("\n📝 Checking text content integrity...")
     
     text_mismatches = 0
-    
+
+    # Precompute the case-insensitive filename lookup once instead of
+    # scanning source_files for every vector
+    upper_to_source = {fn.upper(): fn for fn in source_files.keys()}
+
+    # Hash each source text once; comparing 16-byte digests is far cheaper
+    # than comparing (and on mismatch re-scanning) long strings in Python
+    source_hashes = {
+        fn: hashlib.blake2b(text.strip().encode('utf-8'), digest_size=16).digest()
+        for fn, text in source_files.items()
+    }
+
     for vector_id, vector_data in db_vectors.items():
         if not vector_id.startswith('meeting-'):
             continue
-        
-        # Extract filename from vector ID
+
+        # Extract filename from vector ID (handles case variations)
         filename = vector_id.replace('meeting-', '').upper()
-        # Handle case variations
-        matching_filename = None
-        for source_filename in source_files.keys():
-            if source_filename.upper() == filename:
-                matching_filename = source_filename
-                break
-        
+        matching_filename = upper_to_source.get(filename)
+
         if not matching_filename:
             result.add_warning(f"Could not find source file for vector {vector_id}")
             continue
@@ -239,9 +339,10 @@ def validate_text_content(
         metadata = vector_data.metadata or {}
         db_text = metadata.get('text', '').strip()
         source_text = source_files[matching_filename].strip()
-        
-        # Compare texts
-        if db_text == source_text:
+
+        # Compare hashes first; only diff character-by-character on mismatch
+        db_hash = hashlib.blake2b(db_text.encode('utf-8'), digest_size=16).digest()
+        if db_hash == source_hashes[matching_filename]:
             result.add_pass(f"Text content matches for {matching_filename}")
         else:
             text_mismatches += 1
@@ -275,20 +376,20 @@ def validate_metadata(
     """Validate metadata structure and content."""
     print("\n🏷️  Checking metadata...")
     
-    required_metadata_fields = ['text', 'filename', 'source']
-    
     for vector_id, vector_data in db_vectors.items():
         if not vector_id.startswith('meeting-'):
             continue
-        
+
         metadata = vector_data.metadata or {}
-        
-        # Check required fields
-        for field in required_metadata_fields:
-            if metadata and field in metadata:
-                result.add_pass(f"Metadata field '{field}' present for {vector_id}")
-            else:
-                result.add_fail(f"Missing required metadata field '{field}' for {vector_id}")
+
+        # Check required fields with set operations instead of per-field
+        # membership tests
+        present = REQUIRED_METADATA_FIELDS & metadata.keys()
+        missing = REQUIRED_METADATA_FIELDS - metadata.keys()
+        for field in present:
+            result.add_pass(f"Metadata field '{field}' present for {vector_id}")
+        for field in missing:
+            result.add_fail(f"Missing required metadata field '{field}' for {vector_id}")
         
         # Validate filename matches
         if metadata and 'filename' in metadata:
@@ -321,13 +422,15 @@ def validate_embeddings(
     print("\n🔢 Checking embeddings...")
     
     embedding_issues = 0
-    
+
+    # First pass: structural checks, collecting texts for regeneration
+    to_validate = []
     for vector_id, vector_data in db_vectors.items():
         if not vector_id.startswith('meeting-'):
             continue
-        
+
         values = vector_data.values or []
-        
+
         # Check dimension
         if len(values) == DIMENSION:
             result.add_pass(f"Embedding dimension correct for {vector_id} ({DIMENSION})")
@@ -337,52 +440,58 @@ def validate_embeddings(
                 f"Embedding dimension mismatch for {vector_id}: "
                 f"expected {DIMENSION}, got {len(values)}"
             )
-        
+
         # Check if embedding is all zeros (unlikely but possible error)
         if values and all(v == 0.0 for v in values):
             embedding_issues += 1
             result.add_fail(f"Embedding is all zeros for {vector_id}")
-        
-        # Validate embedding matches regenerated embedding
+
         metadata = vector_data.metadata or {}
         db_text = metadata.get('text', '') if metadata else ''
-        
+
         if db_text:
-            try:
-                # Regenerate embedding from stored text
-                regenerated_embedding = get_openai_embedding(db_text)
-                
-                # Compare dimensions
-                if len(regenerated_embedding) != len(values):
-                    result.add_warning(
-                        f"Embedding dimension changed for {vector_id} "
-                        f"(model may have been updated)"
-                    )
-                else:
-                    # Check if embeddings are similar (they should be identical)
-                    # Use cosine similarity check
-                    db_vec = np.array(values)
-                    regen_vec = np.array(regenerated_embedding)
-                    
-                    # Normalize vectors
-                    db_norm = db_vec / (np.linalg.norm(db_vec) + 1e-10)
-                    regen_norm = regen_vec / (np.linalg.norm(regen_vec) + 1e-10)
-                    
-                    similarity = np.dot(db_norm, regen_norm)
-                    
-                    if similarity > 0.99:  # Very high similarity threshold
-                        result.add_pass(
-                            f"Embedding validation passed for {vector_id} "
-                            f"(similarity: {similarity:.4f})"
-                        )
-                    else:
-                        result.add_warning(
-                            f"Embedding similarity check for {vector_id}: {similarity:.4f} "
-                            f"(may indicate model change or data corruption)"
-                        )
-            except Exception as e:
-                result.add_warning(f"Could not validate embedding for {vector_id}: {e}")
-    
+            to_validate.append((vector_id, values, db_text))
+
+    # Second pass: regenerate all embeddings with batched API calls instead
+    # of one round-trip per vector
+    regenerated = batch_openai_embeddings([db_text for _, _, db_text in to_validate])
+
+    # Third pass: compare stored vs regenerated embeddings. Instead of a
+    # python loop of per-pair dot products, stack comparable pairs into two
+    # (N, D) matrices and compute all cosine similarities in one numpy pass.
+    comparable = []
+    for (vector_id, values, db_text), regenerated_embedding in zip(to_validate, regenerated):
+        if regenerated_embedding is None:
+            result.add_warning(f"Could not validate embedding for {vector_id}: batch embedding failed")
+        elif len(regenerated_embedding) != len(values):
+            result.add_warning(
+                f"Embedding dimension changed for {vector_id} "
+                f"(model may have been updated)"
+            )
+        else:
+            comparable.append((vector_id, values, regenerated_embedding))
+
+    if comparable:
+        db_mat = np.array([values for _, values, _ in comparable], dtype=np.float32)
+        regen_mat = np.array([regen for _, _, regen in comparable], dtype=np.float32)
+
+        # Normalize rows, then row-wise dot product = cosine similarity
+        db_mat /= np.linalg.norm(db_mat, axis=1, keepdims=True) + 1e-10
+        regen_mat /= np.linalg.norm(regen_mat, axis=1, keepdims=True) + 1e-10
+        similarities = np.einsum('ij,ij->i', db_mat, regen_mat)
+
+        for (vector_id, _, _), similarity in zip(comparable, similarities):
+            if similarity > 0.99:  # Very high similarity threshold
+                result.add_pass(
+                    f"Embedding validation passed for {vector_id} "
+                    f"(similarity: {similarity:.4f})"
+                )
+            else:
+                result.add_warning(
+                    f"Embedding similarity check for {vector_id}: {similarity:.4f} "
+                    f"(may indicate model change or data corruption)"
+                )
+
     result.stats['Embedding Issues'] = embedding_issues
 
 
@@ -395,25 +504,25 @@ def validate_vector_ids(
     print("\n🆔 Checking vector IDs...")
     
     expected_pattern = "meeting-{filename}"
-    
+
+    # Precompute the case-insensitive ID lookup once instead of scanning
+    # db_vectors for every source file
+    lower_to_db_id = {vector_id.lower(): vector_id for vector_id in db_vectors.keys()}
+
     for filename in source_files.keys():
         expected_id = f"meeting-{filename.lower()}"
-        
+
         if expected_id in db_vectors:
             result.add_pass(f"Vector ID format correct for {filename}: {expected_id}")
         else:
             # Try to find it with different case
-            found = False
-            for vector_id in db_vectors.keys():
-                if vector_id.lower() == expected_id.lower():
-                    result.add_warning(
-                        f"Vector ID case mismatch for {filename}: "
-                        f"expected {expected_id}, found {vector_id}"
-                    )
-                    found = True
-                    break
-            
-            if not found:
+            found_id = lower_to_db_id.get(expected_id.lower())
+            if found_id is not None:
+                result.add_warning(
+                    f"Vector ID case mismatch for {filename}: "
+                    f"expected {expected_id}, found {found_id}"
+                )
+            else:
                 result.add_fail(f"Vector ID not found for {filename}: {expected_id}")
 
 
@@ -1,7 +1,11 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 BASE_URL = "http://localhost:8000"
 
+# Shared session so all requests reuse one TCP connection
+session = requests.Session()
+
 def test_qa_endpoint():
     """Test the /question-answer-data endpoint"""
     
@@ -18,28 +22,42 @@ def test_qa_endpoint():
         "Which customers need Salesforce integration?"
     ]
     
-    for i, question in enumerate(questions, 1):
-        print(f"\n📋 TEST {i}: {question}")
-        print("-" * 70)
-        
-        response = requests.post(
-            f"{BASE_URL}/question-answer-data",
-            json={"question": question}
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Success!")
-            print(f"\n{data['formatted_output']}")
-        else:
-            print(f"❌ Error: {response.text}")
-    
+    # Fire all five questions concurrently - they're independent, so total
+    # wall time is the slowest answer instead of the sum of all of them
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = {
+            executor.submit(
+                session.post,
+                f"{BASE_URL}/question-answer-data",
+                json={"question": question, "cache_options": {"enabled": "on"}}
+            ): (i, question)
+            for i, question in enumerate(questions, 1)
+        }
+
+        for future in as_completed(futures):
+            i, question = futures[future]
+            print(f"\n📋 TEST {i}: {question}")
+            print("-" * 70)
+
+            try:
+                response = future.result()
+            except Exception as e:
+                print(f"❌ Error: {e}")
+                continue
+
+            if response.status_code == 200:
+                data = response.json()
+                print(f"✅ Success!")
+                print(f"\n{data['formatted_output']}")
+            else:
+                print(f"❌ Error: {response.text}")
+
     # Test error handling
     print("\n" + "="*70)
     print("📋 TEST: Empty question (should fail gracefully)")
     print("-" * 70)
     
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/question-answer-data",
         json={"question": ""}
     )
@@ -53,5 +71,42 @@ def test_qa_endpoint():
     print("TESTS COMPLETE")
     print("="*70 + "\n")
 
+
+def test_qa_streaming():
+    """Test the /question-answer-data/stream endpoint"""
+    import json
+
+    print("\n" + "="*70)
+    print("TESTING Q&A STREAMING ENDPOINT")
+    print("="*70)
+
+    question = "What companies did we meet with this week?"
+    print(f"\n📋 STREAM TEST: {question}")
+    print("-" * 70)
+
+    response = session.post(
+        f"{BASE_URL}/question-answer-data/stream",
+        json={"question": question},
+        stream=True
+    )
+
+    if response.status_code != 200:
+        print(f"❌ Error: {response.text}")
+        return
+
+    # SSE: data lines carry answer fragments, a final done event ends it
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data: "):
+            continue
+        payload = line[len("data: "):]
+        if payload == "{}":
+            break
+        print(json.loads(payload).get("token", ""), end="", flush=True)
+
+    print("\n\n✅ Stream complete")
+    print("="*70 + "\n")
+
+
 if __name__ == "__main__":
-    test_qa_endpoint()
\ No newline at end of file
+    test_qa_endpoint()
+    test_qa_streaming()
\ No newline at end of file
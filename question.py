@@ -1,35 +1,67 @@
 from vdb import search_pinecone, get_openai_embedding
 from openai import OpenAI
+import functools
 import os
 from typing import Dict
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def get_relevant_context_for_question(question: str, top_k: int = 5) -> str:
+# Built once at import instead of on every call
+SYSTEM_PROMPT_QA = """
+    You are a helpful assistant that answers questions based ONLY on the provided meeting notes.
+    Rules:
+    - Answer based on the context provided
+    - If the answer isn't in the meetings, say "I don't have that information"
+    - Be concise and direct
+    - Cite specific companies/names when relevant
+    - OUTPUT your answers:
+    QUESTION & ANSWER
+    ======================================================================
+    Q: What companies did we meet with this week?
+    ----------------------------------------------------------------------
+    A: We met with five companies this week: ACME Corp (Sarah Chen),
+    TechStart (Mike Patterson), BuildCo Inc. (Jane Martinez), DataFlow
+    Systems (Marcus Johnson), and NexGen Solutions (Rebecca Torres).
+    ======================================================================
+    Based on 5 relevant meetings"""
+
+
+@functools.lru_cache(maxsize=256)
+def _embed_question(question: str) -> tuple:
+    """
+    Embed a question, cached by normalized text.
+
+    Repeated questions (common in demos and test runs) skip the embedding
+    round-trip entirely. Returns a tuple so the cached value is immutable.
+    """
+    return tuple(get_openai_embedding(question))
+
+
+def get_relevant_context_for_question(question: str, top_k: int = 5) -> tuple:
     """
     Retrieve relevant meetings for answering the question
-    
+
     Args:
         question: The user's question (e.g., "Who is our contact at ACME?")
         top_k: Number of relevant meetings to retrieve
-    
+
     Returns:
-        Combined context from relevant meetings
+        Tuple of (combined context from relevant meetings, meeting count)
     """
     
     print(f"🔍 Searching for meetings relevant to: '{question}'")
-    #pass question directly
-    results = search_pinecone(query_text=question, top_k=top_k)
+    # Embed via the per-question cache so repeated questions skip the API call
+    query_embedding = list(_embed_question(question.strip()))
+    results = search_pinecone(query_text=question, top_k=top_k,
+                              precomputed_vector=query_embedding)
     
     # Extract text and filename from each result's metadata
     context_parts = []
     for result in results:
-        meeting_text = result['metadata'].get('text', '')
-        filename = result['metadata'].get('filename', 'Unknown')
+        meeting_text = result.metadata.get('text', '')
+        filename = result.metadata.get('filename', 'Unknown')
         context_parts.append(f"--- {filename} ---\n{meeting_text}\n")
-    return "\n".join(context_parts)
-    
-    pass
+    return "\n".join(context_parts), len(results)
 
 
 def answer_question(question: str) -> Dict:
@@ -53,28 +85,9 @@ def answer_question(question: str) -> Dict:
             "error": "Empty or invalid question provided"
         }
     
-    #  Get relevant context
-    context = get_relevant_context_for_question(question, top_k=5)
-    
-    #  Build system prompt
-    #  Tell GPT it's a helpful assistant that answers based ONLY on provided meetings
-    system_prompt = """
-    You are a helpful assistant that answers questions based ONLY on the provided meeting notes.
-    Rules:
-    - Answer based on the context provided
-    - If the answer isn't in the meetings, say "I don't have that information"
-    - Be concise and direct
-    - Cite specific companies/names when relevant
-    - OUTPUT your answers:
-    QUESTION & ANSWER
-    ======================================================================
-    Q: What companies did we meet with this week?
-    ----------------------------------------------------------------------
-    A: We met with five companies this week: ACME Corp (Sarah Chen), 
-    TechStart (Mike Patterson), BuildCo Inc. (Jane Martinez), DataFlow 
-    Systems (Marcus Johnson), and NexGen Solutions (Rebecca Torres).
-    ======================================================================
-    Based on 5 relevant meetings"""
+    #  Get relevant context (and the actual meeting count, so we don't have
+    #  to re-split the joined text later just to count delimiters)
+    context, meetings_used = get_relevant_context_for_question(question, top_k=5)
     
     # Build user prompt
     # Include both the context and the question
@@ -86,7 +99,7 @@ def answer_question(question: str) -> Dict:
         response = client.chat.completions.create(
              model="gpt-4o-mini",
              messages=[
-                 {"role": "system", "content": system_prompt},
+                 {"role": "system", "content": SYSTEM_PROMPT_QA},
                  {"role": "user", "content": user_prompt}
              ],
              timeout=60
@@ -100,7 +113,7 @@ def answer_question(question: str) -> Dict:
             "status": "success",
              "question": question,
              "answer": answer,
-             "meetings_used": len(context.split("---"))
+             "meetings_used": meetings_used
         }
     except Exception as e:
         print(f"❌ Error: {str(e)}")
@@ -110,6 +123,43 @@ def answer_question(question: str) -> Dict:
             "meetings_analyzed": 0
         }
 
+def answer_question_stream(question: str):
+    """
+    Stream the answer to a question token by token.
+
+    Same retrieval and prompt as answer_question, but the chat call uses
+    stream=True so the first tokens arrive in hundreds of milliseconds
+    instead of after the full generation.
+
+    Args:
+        question: The user's question
+
+    Yields:
+        Text fragments of the answer as GPT generates them
+    """
+    #  Get relevant context
+    context, meetings_used = get_relevant_context_for_question(question, top_k=5)
+
+    user_prompt = f"""Context from meetings:\n{context}\n\nQuestion: {question}"""
+
+    print("🤖 Streaming answer using GPT...")
+
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT_QA},
+            {"role": "user", "content": user_prompt}
+        ],
+        stream=True,
+        timeout=60
+    )
+
+    for chunk in response:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
 def format_qa_output(qa_data: Dict) -> str:
     """
     Format Q&A output for display
@@ -122,13 +172,14 @@ def format_qa_output(qa_data: Dict) -> str:
     """
     
  
-    output = "QUESTION & ANSWER\n"
-    output += "=" * 70 + "\n"
-    output += f"Q: {qa_data.get('question', 'N/A')}\n"
-    output += "-" * 70 + "\n"
-    output += f"A: {qa_data.get('answer', 'N/A')}\n"
-    output += "=" * 70 + "\n"
-    output += f"Based on {qa_data.get('meetings_used', 0)} relevant meetings"
-    return output
-    
-   
\ No newline at end of file
+    # Collect lines and join once instead of repeated string concatenation
+    output = [
+        "QUESTION & ANSWER",
+        "=" * 70,
+        f"Q: {qa_data.get('question', 'N/A')}",
+        "-" * 70,
+        f"A: {qa_data.get('answer', 'N/A')}",
+        "=" * 70,
+        f"Based on {qa_data.get('meetings_used', 0)} relevant meetings",
+    ]
+    return "\n".join(output)
\ No newline at end of file
@@ -1,10 +1,76 @@
-from vdb import search_pinecone, get_openai_embedding
+from vdb import search_pinecone, get_openai_embeddings_batch
 from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import hashlib
+import itertools
 import os
-from typing import Dict
+import tiktoken
+from typing import Dict, List, Tuple
 
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Cap on the meeting context sent to GPT - input cost and latency scale
+# linearly with prompt length, so stop adding meetings past this point
+CONTEXT_TOKEN_BUDGET = 30_000
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    """Tokenizer for the extraction model (loaded once, it's not cheap)."""
+    return tiktoken.encoding_for_model("gpt-4o-mini")
+
+# Built once at import instead of on every call
+SYSTEM_PROMPT_TASK = """You are an expert at extracting and prioritizing action items from sales meetings.
+
+Your job:
+1. Read through ALL provided meetings
+2. Extract EVERY action item/task mentioned
+3. Identify which COMPANY each task is for (look at filenames: acme, buildco, techstart, etc.)
+4. Categorize by urgency:
+   - HIGH: Due this week, critical deadlines, urgent follow-ups
+   - MEDIUM: Due next week, important but not urgent
+   - LOW: Ongoing tasks, long-term items
+5. Sort by deadline within each priority level
+
+Output exactly in this format:
+
+HIGH PRIORITY (This Week)
+├─ Task: [Description] - [Company Name]
+│  ├─ Deadline: [When]
+│  ├─ Owner: [Who]
+│  └─ Details: [Context]
+
+MEDIUM PRIORITY (Next Week)
+└─ Task: [Description] - [Company Name]
+   ├─ Deadline: [When]
+   └─ Owner: [Who]
+
+LOW PRIORITY (Ongoing)
+└─ Task: [Description] - [Company Name]
+   └─ Owner: [Who]
+
+CRITICAL: Always include company name with each task!"""
+
+
+@functools.lru_cache(maxsize=32)
+def _embed_queries(queries: Tuple[str, ...]) -> List:
+    """
+    Embed several query strings in one OpenAI call.
+
+    The multi-strategy queries are constant, so the lru_cache means each
+    process pays for exactly one embedding round-trip no matter how many
+    times the strategy runs.
+
+    Args:
+        queries: Tuple of query strings (tuple so the cache can key on it)
+
+    Returns:
+        List of embedding vectors, aligned with queries
+    """
+    return get_openai_embeddings_batch(list(queries))
+
+
 def get_all_meetings_context(strategy: str = "generic") -> str:
     """
     Retrieve meetings from Pinecone for task analysis
@@ -34,30 +100,58 @@ def get_all_meetings_context(strategy: str = "generic") -> str:
             "quotes proposals contracts"
         ]
         
-        all_results = []
-        for query in queries:
-            results = search_pinecone(query, top_k=10)
-            all_results.extend(results)
+        # Embed all queries in one batched (and cached) API call, then pass
+        # the vectors through so search_pinecone doesn't re-embed each one
+        query_embeddings = _embed_queries(tuple(queries))
+
+        # The queries are independent, so run them concurrently - total wall
+        # time is the slowest query instead of the sum of all four
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            result_lists = list(executor.map(
+                lambda pair: search_pinecone(pair[0], top_k=10, precomputed_vector=pair[1]),
+                zip(queries, query_embeddings)
+            ))
+        all_results = list(itertools.chain.from_iterable(result_lists))
         
-        # Remove duplicates by ID
-        seen_ids = set()
-        results = []
+        # Remove duplicates by ID, keeping the highest-scoring hit for each
+        # meeting, then rank best-first
+        best = {}
         for r in all_results:
-            if r['id'] not in seen_ids:
-                results.append(r)
-                seen_ids.add(r['id'])
+            current = best.get(r.id)
+            if current is None or r.score > current.score:
+                best[r.id] = r
+        results = sorted(best.values(), key=lambda r: -r.score)
     
-    # Build context from results
+    # Build context from results, best first, skipping textually identical
+    # meetings (the multi queries can return near-duplicate hit sets) and
+    # stopping once the token budget is spent
+    encoding = _encoding()
+    results = sorted(results, key=lambda r: -r.score)
+
     context_parts = []
-    for i, result in enumerate(results):
-        meeting_text = result['metadata'].get('text', '')
-        filename = result['metadata'].get('filename', 'Unknown')
-        
-        context_parts.append(
-            f"--- Meeting {i+1} [{filename}] (Score: {result['score']:.3f}) ---\n{meeting_text}\n"
+    seen_hashes = set()
+    tokens_used = 0
+    for result in results:
+        meeting_text = result.metadata.get('text', '')
+        filename = result.metadata.get('filename', 'Unknown')
+
+        text_hash = hashlib.sha256(meeting_text.encode('utf-8')).digest()
+        if text_hash in seen_hashes:
+            continue
+
+        block = (
+            f"--- Meeting {len(context_parts)+1} [{filename}] "
+            f"(Score: {result.score:.3f}) ---\n{meeting_text}\n"
         )
-    
-    print(f"✓ Retrieved {len(results)} meetings")
+        block_tokens = len(encoding.encode(block))
+        if context_parts and tokens_used + block_tokens > CONTEXT_TOKEN_BUDGET:
+            break
+
+        seen_hashes.add(text_hash)
+        context_parts.append(block)
+        tokens_used += block_tokens
+
+    print(f"✓ Retrieved {len(context_parts)} meetings ({tokens_used} tokens)")
     return "\n".join(context_parts)
 
 
@@ -82,43 +176,12 @@ def extract_task_priorities(meeting_notes: str = None) -> Dict:
         full_context = all_meetings_context
     
     print("🤖 Analyzing meetings and extracting tasks...")
-    
-    system_prompt = """You are an expert at extracting and prioritizing action items from sales meetings.
-
-Your job:
-1. Read through ALL provided meetings
-2. Extract EVERY action item/task mentioned
-3. Identify which COMPANY each task is for (look at filenames: acme, buildco, techstart, etc.)
-4. Categorize by urgency:
-   - HIGH: Due this week, critical deadlines, urgent follow-ups
-   - MEDIUM: Due next week, important but not urgent
-   - LOW: Ongoing tasks, long-term items
-5. Sort by deadline within each priority level
-
-Output exactly in this format:
-
-HIGH PRIORITY (This Week)
-├─ Task: [Description] - [Company Name]
-│  ├─ Deadline: [When]
-│  ├─ Owner: [Who]
-│  └─ Details: [Context]
-
-MEDIUM PRIORITY (Next Week)  
-└─ Task: [Description] - [Company Name]
-   ├─ Deadline: [When]
-   └─ Owner: [Who]
-
-LOW PRIORITY (Ongoing)
-└─ Task: [Description] - [Company Name]
-   └─ Owner: [Who]
-
-CRITICAL: Always include company name with each task!"""
 
     try:
         response = client.chat.completions.create(
             model="gpt-4o-mini",
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": SYSTEM_PROMPT_TASK},
                 {"role": "user", "content": f"Extract all tasks:\n\n{full_context}"}
             ]
         )
@@ -141,12 +204,53 @@ CRITICAL: Always include company name with each task!"""
         }
 
 
+def extract_task_priorities_stream(meeting_notes: str = None):
+    """
+    Stream the prioritized task list token by token.
+
+    Same context building and prompt as extract_task_priorities, but the
+    chat call uses stream=True so callers see output while GPT is still
+    generating.
+
+    Args:
+        meeting_notes: Optional new meeting notes to include
+
+    Yields:
+        Text fragments of the task list as GPT generates them
+    """
+    all_meetings_context = get_all_meetings_context(strategy="generic")
+
+    if meeting_notes:
+        full_context = f"{all_meetings_context}\n\n--- NEW MEETING (TO BE ADDED) ---\n{meeting_notes}"
+    else:
+        full_context = all_meetings_context
+
+    print("🤖 Streaming task analysis...")
+
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": SYSTEM_PROMPT_TASK},
+            {"role": "user", "content": f"Extract all tasks:\n\n{full_context}"}
+        ],
+        stream=True
+    )
+
+    for chunk in response:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+
 def format_task_output(task_data: Dict) -> str:
     """Format task output for display"""
-    output = "TASK PRIORITY LIST\n"
-    output += "=" * 70 + "\n"
-    output += f"Meetings Analyzed: {task_data.get('meetings_analyzed', 0)}\n"
-    output += "=" * 70 + "\n\n"
-    output += task_data.get('tasks', 'No tasks found')
-    
-    return output
\ No newline at end of file
+    # Collect lines and join once instead of repeated string concatenation
+    output = [
+        "TASK PRIORITY LIST",
+        "=" * 70,
+        f"Meetings Analyzed: {task_data.get('meetings_analyzed', 0)}",
+        "=" * 70,
+        "",
+        task_data.get('tasks', 'No tasks found'),
+    ]
+    return "\n".join(output)
\ No newline at end of file
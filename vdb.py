@@ -1,13 +1,24 @@
+import asyncio
+import hashlib
+import logging
 import os
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import List, Dict, Any, Optional
+
+import numpy as np
 from pinecone import Pinecone, ServerlessSpec
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+from tqdm import tqdm
 
 load_dotenv()
 
+log = logging.getLogger(__name__)
+
 # Initialize clients
 pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
 openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
@@ -15,60 +26,208 @@ openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 # Index configuration
 INDEX_NAME = "meeting-notes"
 DIMENSION = 1536  # OpenAI text-embedding-3-small default dimension
+EMBED_MODEL = "text-embedding-3-small"
 DATA_DIR = Path(__file__).parent / "data"
 
-# Check if index exists, create if it doesn't
-existing_indexes = [index_info["name"] for index_info in pc.list_indexes()]
+# Bind the model once so hot embedding paths skip the per-call kwarg dict
+# rebuild and attribute chain
+_create_embedding = partial(openai_client.embeddings.create, model=EMBED_MODEL)
 
-if INDEX_NAME not in existing_indexes:
-    print(f"Creating index '{INDEX_NAME}'...")
-    pc.create_index(
-        name=INDEX_NAME,
-        dimension=DIMENSION,
-        metric="cosine",
-        spec=ServerlessSpec(cloud="aws", region="us-east-1")
-    )
-    # Wait for index to be ready
-    print("Waiting for index to be ready...")
-    while not pc.describe_index(INDEX_NAME).status["ready"]:
-        time.sleep(1)
-    print(f"Index '{INDEX_NAME}' is ready!")
-else:
-    print(f"Index '{INDEX_NAME}' already exists.")
+# Sentinel recording that the index was already verified to exist - lets
+# every later process skip the control-plane round-trip entirely
+_READY_SENTINEL = Path(__file__).parent / ".pinecone_ready"
+_index_ready = _READY_SENTINEL.exists()
+
+def ensure_index() -> None:
+    """
+    Make sure the Pinecone index exists, creating it if needed.
+
+    Previously this check ran at import time, adding 1-2 network
+    round-trips to every `import vdb` (API server cold start, testers).
+    Now it runs lazily on first data-plane use, at most once per process,
+    and not at all once the .pinecone_ready sentinel exists.
+    """
+    global _index_ready
+    if _index_ready:
+        return
+
+    # Check if index exists, create if it doesn't
+    existing_indexes = [index_info["name"] for index_info in pc.list_indexes()]
+
+    if INDEX_NAME not in existing_indexes:
+        print(f"Creating index '{INDEX_NAME}'...")
+        pc.create_index(
+            name=INDEX_NAME,
+            dimension=DIMENSION,
+            metric="cosine",
+            spec=ServerlessSpec(cloud="aws", region="us-east-1")
+        )
+        # Wait for index to be ready, backing off exponentially so slow
+        # provisioning doesn't hammer the control-plane API every second
+        print("Waiting for index to be ready...")
+        delay = 1.0
+        while not pc.describe_index(INDEX_NAME).status["ready"]:
+            time.sleep(delay)
+            delay = min(delay * 2, 30.0)
+        print(f"Index '{INDEX_NAME}' is ready!")
+
+    _index_ready = True
+    try:
+        _READY_SENTINEL.touch()
+    except Exception:
+        # Sentinel is an optimization; the in-process flag still holds
+        pass
+
+
+_index = None
+
+
+def get_index():
+    """
+    Return the Pinecone index handle, creating it on first use.
+
+    pc.Index(name) without an explicit host resolves the index host via a
+    control-plane describe_index call, so building the handle eagerly would
+    put a network round-trip back into every `import vdb` - and crash at
+    import on a fresh project where the index doesn't exist yet. Deferring
+    it here keeps imports offline and lets ensure_index() create the index
+    before the host lookup runs.
+    """
+    global _index
+    if _index is None:
+        ensure_index()
+        _index = pc.Index(INDEX_NAME)
+    return _index
 
-# Get the index
-index = pc.Index(INDEX_NAME)
 
+class _LazyIndex:
+    """
+    Import-time stand-in for the index handle.
 
-def get_openai_embedding(text: str) -> list:
+    Keeps `from vdb import index` working for dependents (app, crm_data)
+    while delegating every attribute access to the real handle from
+    get_index(), created on first use.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_index(), name)
+
+
+index = _LazyIndex()
+
+
+def _get_openai_embedding_uncached(text: str) -> np.ndarray:
+    """Generate an embedding with a direct API call (no caching)."""
+    response = _create_embedding(input=text)
+    # float32 ndarray: half the bytes of float64 and far smaller than a
+    # list of 1536 boxed Python floats
+    return np.asarray(response.data[0].embedding, dtype=np.float32)
+
+
+@lru_cache(maxsize=1024)
+def get_openai_embedding(text: str) -> np.ndarray:
     """
     Generate embedding for text using OpenAI's text-embedding-3-small model.
-    
+
+    Results are memoized per process (~6 KB per entry as float32), so
+    repeated query strings - common in test harnesses and interactive use -
+    skip the API round-trip. Bulk one-shot paths (e.g. populate) should call
+    _get_openai_embedding_uncached to avoid churning the cache.
+
     Args:
         text: The text to generate an embedding for
-        
+
     Returns:
-        List of floats representing the embedding vector (1536 dimensions)
+        float32 ndarray representing the embedding vector (1536 dimensions)
     """
-    response = openai_client.embeddings.create(
-        model="text-embedding-3-small",
-        input=text
-    )
-    return response.data[0].embedding
+    return _get_openai_embedding_uncached(text)
+
+
+# Content-addressed embedding cache - the embedding model is deterministic
+# for a given input, so unchanged texts never need re-embedding. Vectors are
+# stored as float32 .npy files keyed by sha256(text).
+EMBCACHE_DIR = Path(__file__).parent / ".embcache"
+
+
+def _embcache_path(text: str) -> Path:
+    """Cache file path for a text."""
+    return EMBCACHE_DIR / f"{hashlib.sha256(text.encode()).hexdigest()}.npy"
+
+
+def _embcache_get(text: str) -> Optional[np.ndarray]:
+    """Return the cached embedding for text, or None on a miss."""
+    path = _embcache_path(text)
+    if path.exists():
+        try:
+            return np.load(path)
+        except Exception:
+            # Corrupt cache file - treat as a miss and re-embed
+            pass
+    return None
+
+
+def _embcache_put(text: str, embedding) -> None:
+    """Store an embedding in the on-disk cache (best effort)."""
+    try:
+        EMBCACHE_DIR.mkdir(exist_ok=True)
+        np.save(_embcache_path(text), np.asarray(embedding, dtype=np.float32))
+    except Exception as e:
+        print(f"Warning: could not write embedding cache: {e}")
+
+
+def cached_embedding(text: str) -> np.ndarray:
+    """
+    Generate an embedding for text, using the on-disk cache when possible.
+
+    Args:
+        text: The text to generate an embedding for
+
+    Returns:
+        float32 ndarray representing the embedding vector (1536 dimensions)
+    """
+    embedding = _embcache_get(text)
+    if embedding is None:
+        embedding = _get_openai_embedding_uncached(text)
+        _embcache_put(text, embedding)
+    return embedding
+
+
+def get_openai_embeddings_batch(texts: List[str], batch_size: int = 96) -> List[np.ndarray]:
+    """
+    Generate embeddings for several texts in one API call per batch.
+
+    The embeddings endpoint accepts a list input, so N texts cost
+    ceil(N/batch_size) round-trips instead of N - embedding latency is
+    dominated by the network, not compute.
+
+    Args:
+        texts: The texts to generate embeddings for
+        batch_size: Maximum texts per API call (default: 96)
+
+    Returns:
+        List of float32 embedding ndarrays, aligned with texts
+    """
+    embeddings = []
+    for i in range(0, len(texts), batch_size):
+        response = _create_embedding(input=texts[i:i + batch_size])
+        embeddings.extend(
+            np.asarray(item.embedding, dtype=np.float32) for item in response.data
+        )
+    return embeddings
 
 
 def upsert_to_pinecone(
-    vector_id: str, 
-    embedding: list, 
-    text: str, 
+    vector_id: str,
+    embedding,
+    text: str,
     metadata: Optional[Dict[str, Any]] = None
 ) -> None:
     """
     Upsert a vector to Pinecone with metadata.
-    
+
     Args:
         vector_id: Unique identifier for the vector (e.g., "acme-2024-01-04")
-        embedding: The embedding vector (list of floats)
+        embedding: The embedding vector (float32 ndarray or list of floats)
         text: The original text content (stored in metadata)
         metadata: Additional metadata dictionary (optional)
     
@@ -80,6 +239,8 @@ def upsert_to_pinecone(
             metadata={"company": "ACME", "contact": "Sarah Chen"}
         )
     """
+    ensure_index()
+
     # Prepare metadata - always include the original text
     vector_metadata = {"text": text}
     if metadata:
@@ -87,88 +248,273 @@ def upsert_to_pinecone(
     
     # Upsert to Pinecone
     # Format: (id, vector, metadata)
+    # The Pinecone client expects plain lists, so convert at this boundary
     index.upsert(
         vectors=[{
             "id": vector_id,
-            "values": embedding,
+            "values": np.asarray(embedding, dtype=np.float32).tolist(),
             "metadata": vector_metadata
         }]
     )
 
 
+def upsert_many(records: List[Dict[str, Any]]) -> None:
+    """
+    Upsert many vectors to Pinecone in chunked batch calls.
+
+    index.upsert accepts a list of vectors (up to ~100 per request), so N
+    records cost ceil(N/100) HTTPS calls instead of one call each.
+
+    Args:
+        records: List of {"id": ..., "values": ..., "metadata": ...} dicts
+    """
+    ensure_index()
+
+    batch_size = 100
+    for i in range(0, len(records), batch_size):
+        # The Pinecone client expects plain lists, so convert ndarray
+        # values at this boundary
+        index.upsert(vectors=[
+            {**record, "values": np.asarray(record["values"], dtype=np.float32).tolist()}
+            for record in records[i:i + batch_size]
+        ])
+
+
+# Lightweight search hit: ~3x smaller than a dict per match with C-level
+# attribute access; call ._asdict() where a real dict is needed (e.g. JSON)
+Result = namedtuple("Result", ["id", "score", "metadata"])
+
+
 def search_pinecone(
-    query_text: str, 
+    query_text: str,
     top_k: int = 5,
-    include_metadata: bool = True
-) -> List[Dict[str, Any]]:
+    include_metadata: bool = True,
+    precomputed_vector: Optional[list] = None
+) -> List[Result]:
     """
     Search Pinecone for similar meeting notes using semantic similarity.
-    
+
     Args:
         query_text: The search query text (will be embedded automatically)
         top_k: Number of results to return (default: 5)
         include_metadata: Whether to include metadata in results (default: True)
-    
+        precomputed_vector: Optional embedding for query_text; pass it when the
+            caller has already embedded the text to skip a second OpenAI call
+
     Returns:
-        List of dictionaries containing:
+        List of Result namedtuples with fields:
         - id: Vector ID
         - score: Similarity score (higher = more similar)
         - metadata: Dictionary with text and other metadata
-    
+
     Example:
         results = search_pinecone("ACME Corp quote deadline", top_k=3)
         for result in results:
-            print(f"Score: {result['score']}, Text: {result['metadata']['text']}")
+            print(f"Score: {result.score}, Text: {result.metadata['text']}")
     """
-    # Generate embedding for the query text
-    query_embedding = get_openai_embedding(query_text)
-    
-    # Search Pinecone
+    ensure_index()
+
+    # Generate embedding for the query text (unless the caller already did)
+    if precomputed_vector is not None:
+        query_embedding = precomputed_vector
+    else:
+        query_embedding = get_openai_embedding(query_text)
+
+    # Search Pinecone (the client expects a plain list, so convert here)
     response = index.query(
-        vector=query_embedding,
+        vector=np.asarray(query_embedding, dtype=np.float32).tolist(),
         top_k=top_k,
         include_metadata=include_metadata
     )
-    
-    # Format results
-    results = []
-    for match in response.matches:
-        results.append({
-            "id": match.id,
-            "score": match.score,
-            "metadata": match.metadata if include_metadata else {}
-        })
-    
-    return results
+
+    # Wrap matches in a thin namedtuple view instead of building a dict
+    # per match
+    return [
+        Result(match.id, match.score, match.metadata if include_metadata else {})
+        for match in response.matches
+    ]
+
+
+def condense_for_crm(text: str, max_chars: int = 500) -> str:
+    """
+    Build a condensed, CRM-shaped summary of a meeting note.
+
+    Keeps only the lines that carry CRM signal (contacts, deal size, dates,
+    concerns) so the summary can be used as a short few-shot example instead
+    of the full transcript, cutting prompt tokens sent to GPT.
+
+    Args:
+        text: Full meeting note text
+        max_chars: Maximum length of the summary (default: 500)
+
+    Returns:
+        Condensed summary string (falls back to a plain truncation if no
+        signal lines are found)
+    """
+    signal_words = (
+        "contact", "meeting", "deal", "budget", "price", "quote", "deadline",
+        "due", "urgent", "license", "seat", "close", "concern", "pain",
+        "next step", "follow", "stage", "timeline"
+    )
+    signal_lines = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        lowered = stripped.lower()
+        if "$" in stripped or any(word in lowered for word in signal_words) \
+                or any(ch.isdigit() for ch in stripped):
+            signal_lines.append(stripped)
+
+    summary = "\n".join(signal_lines) if signal_lines else text
+    return summary[:max_chars]
+
+
+# File contents keyed by path, with (mtime, size) so edits invalidate the
+# entry - repeat calls (e.g. validation re-runs) skip disk I/O for
+# unchanged files
+_FILE_CACHE: Dict[Path, tuple] = {}
 
 
 def read_meeting_notes(data_dir: Path = DATA_DIR) -> Dict[str, str]:
     """
     Read all .txt files from the data directory.
-    
+
+    Files are cached by (mtime, size), so only new or modified files are
+    actually read from disk on repeat calls.
+
     Args:
         data_dir: Path to the data directory (default: ./data)
-    
+
     Returns:
         Dictionary mapping filename (without extension) to file content
     """
     meeting_notes = {}
-    
+
     if not data_dir.exists():
         print(f"Warning: Data directory {data_dir} does not exist!")
         return meeting_notes
-    
-    # Read all .txt files
+
+    # Serve unchanged files from the mtime/size cache; collect the rest
+    to_read = []
     for txt_file in data_dir.glob("*.txt"):
-        filename = txt_file.stem  # filename without extension
-        with open(txt_file, "r", encoding="utf-8") as f:
-            content = f.read().strip()
-            meeting_notes[filename] = content
-            print(f"✓ Read {filename}.txt ({len(content)} characters)")
-    
+        stat = txt_file.stat()
+        cached = _FILE_CACHE.get(txt_file)
+        if cached is not None and cached[:2] == (stat.st_mtime, stat.st_size):
+            meeting_notes[txt_file.stem] = cached[2]
+        else:
+            to_read.append((txt_file, stat))
+
+    if not to_read:
+        return meeting_notes
+
+    # Read the remaining files concurrently so I/O waits overlap (matters
+    # on networked/spinning storage, harmless on local SSD)
+    def _read(item):
+        txt_file, stat = item
+        return txt_file, stat, txt_file.read_text(encoding="utf-8").strip()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for txt_file, stat, content in executor.map(_read, to_read):
+            meeting_notes[txt_file.stem] = content
+            log.debug("read %s.txt (%d characters)", txt_file.stem, len(content))
+            _FILE_CACHE[txt_file] = (stat.st_mtime, stat.st_size, content)
+
     return meeting_notes
 
 
+async def _populate_async(filenames: List[str], texts: List[str], chunk_size: int = 16) -> None:
+    """
+    Embed and upsert meeting notes as an overlapped pipeline.
+
+    Files are processed in chunks of chunk_size: each chunk is embedded
+    with the async OpenAI client and handed to a worker thread for the
+    Pinecone upsert as soon as its vectors are ready, so wall time
+    approaches max(embed time, upsert time) instead of their sum.
+
+    Args:
+        filenames: Filenames (without extension), aligned with texts
+        texts: The meeting note texts to embed and upsert
+        chunk_size: Files per pipeline stage (default: 16)
+    """
+    aclient = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    # One progress bar instead of several prints per file - stdout flushing
+    # is measurable on big directories and interleaves badly across tasks
+    progress = tqdm(total=len(filenames), desc="Embedding+upserting", unit="file")
+
+    # Map each unique text to every filename sharing it, so duplicated
+    # content (same notes saved under two names) is embedded exactly once
+    key_to_text: Dict[str, str] = {}
+    key_to_files: Dict[str, List[str]] = {}
+    for filename, text in zip(filenames, texts):
+        key = hashlib.sha256(text.encode()).hexdigest()
+        key_to_text.setdefault(key, text)
+        key_to_files.setdefault(key, []).append(filename)
+    unique_keys = list(key_to_text)
+
+    async def _process_chunk(chunk_keys: List[str]) -> None:
+        chunk_texts = [key_to_text[key] for key in chunk_keys]
+
+        # Unchanged texts come from the on-disk cache; only new/edited
+        # files hit the API at all
+        embeddings = [_embcache_get(text) for text in chunk_texts]
+        miss_indices = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if miss_indices:
+            try:
+                response = await aclient.embeddings.create(
+                    model=EMBED_MODEL,
+                    input=[chunk_texts[i] for i in miss_indices]
+                )
+                fresh = [np.asarray(item.embedding, dtype=np.float32) for item in response.data]
+                for i, embedding in zip(miss_indices, fresh):
+                    _embcache_put(chunk_texts[i], embedding)
+            except Exception as e:
+                # Fall back to concurrent per-text calls so one bad batch
+                # doesn't sink the chunk (cached_embedding writes the disk
+                # cache itself)
+                log.warning("batch embedding failed (%s); retrying per file", e)
+                fresh = await asyncio.gather(*[
+                    asyncio.to_thread(cached_embedding, chunk_texts[i])
+                    for i in miss_indices
+                ])
+            for i, embedding in zip(miss_indices, fresh):
+                embeddings[i] = embedding
+
+        # Build records, fanning each embedding back out to every filename
+        # that shares the text (crm_summary is the condensed few-shot body
+        # used by CRM extraction so prompts don't carry the full transcript)
+        records = [
+            {
+                "id": f"meeting-{filename.lower()}",
+                "values": embedding,
+                "metadata": {
+                    "text": text,
+                    "filename": filename,
+                    "source": "meeting_notes",
+                    "crm_summary": condense_for_crm(text)
+                }
+            }
+            for key, text, embedding in zip(chunk_keys, chunk_texts, embeddings)
+            for filename in key_to_files[key]
+        ]
+
+        # upsert_many is blocking, so run it in a thread; the event loop is
+        # free to start embedding the next chunk meanwhile
+        await asyncio.to_thread(upsert_many, records)
+        log.info("upserted %d vectors (%s..%s)", len(records),
+                 records[0]["metadata"]["filename"], records[-1]["metadata"]["filename"])
+        progress.update(len(records))
+
+    tasks = [
+        _process_chunk(unique_keys[i:i + chunk_size])
+        for i in range(0, len(unique_keys), chunk_size)
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        progress.close()
+
+
 def populate_database(data_dir: Path = DATA_DIR, overwrite: bool = False) -> None:
     """
     Populate Pinecone database with meeting notes from data directory.
@@ -188,7 +534,9 @@ def populate_database(data_dir: Path = DATA_DIR, overwrite: bool = False) -> Non
     print("\n" + "="*50)
     print("POPULATING PINECONE DATABASE")
     print("="*50 + "\n")
-    
+
+    ensure_index()
+
     # Read all meeting notes
     meeting_notes = read_meeting_notes(data_dir)
     
@@ -197,35 +545,15 @@ def populate_database(data_dir: Path = DATA_DIR, overwrite: bool = False) -> Non
         return
     
     print(f"\nFound {len(meeting_notes)} meeting note files\n")
-    
-    # Process each meeting note
-    for filename, text in meeting_notes.items():
-        print(f"Processing {filename}...")
-        
-        # Generate embedding
-        print(f"  → Generating embedding...")
-        embedding = get_openai_embedding(text)
-        
-        # Create metadata
-        metadata = {
-            "filename": filename,
-            "source": "meeting_notes"
-        }
-        
-        # Create unique ID (using filename as base)
-        vector_id = f"meeting-{filename.lower()}"
-        
-        # Upsert to Pinecone
-        print(f"  → Upserting to Pinecone (ID: {vector_id})...")
-        upsert_to_pinecone(
-            vector_id=vector_id,
-            embedding=embedding,
-            text=text,
-            metadata=metadata
-        )
-        
-        print(f"  ✓ Successfully added {filename}\n")
-    
+
+    # Embed and upsert as an overlapped async pipeline: each chunk is
+    # upserted as soon as its vectors arrive, while the next chunk is
+    # already embedding
+    print("Generating embeddings and upserting (pipelined)...")
+    filenames = list(meeting_notes.keys())
+    texts = [meeting_notes[filename] for filename in filenames]
+    asyncio.run(_populate_async(filenames, texts))
+
     print("="*50)
     print(f"✓ Database population complete! Added {len(meeting_notes)} meeting notes.")
     print("="*50 + "\n")